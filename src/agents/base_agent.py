@@ -1,16 +1,63 @@
 import os
-from typing import List, Dict
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import List, Optional
 from abc import ABC, abstractmethod
-from tavily import TavilyClient
 from src.models import PredictionOutput, EventMetadata, KeyFact
 
+RESEARCH_CACHE_TTL = 3600
+FRESH_RESEARCH_CACHE_TTL = 300
+
+# Queries about fast-moving facts get the short TTL
+_FRESHNESS_PATTERN = re.compile(r"\b(today|now|latest|current|breaking|live|price|odds|20\d\d)\b")
+
+RESEARCH_CACHE_MAX_ENTRIES = 512
+
+# normalized query -> (stored_at, ttl, context), shared by all agents; LRU-bounded like MemoryBackend
+_RESEARCH_CACHE: OrderedDict = OrderedDict()
+QUERY_HITS: OrderedDict = OrderedDict()
+_RESEARCH_LOCK = threading.Lock()
+
+
+def research_cache_ttl(query: str) -> float:
+    return FRESH_RESEARCH_CACHE_TTL if _FRESHNESS_PATTERN.search(query) else RESEARCH_CACHE_TTL
+
+
+def _cached_research(key: str) -> Optional[str]:
+    with _RESEARCH_LOCK:
+        entry = _RESEARCH_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= entry[1]:
+            del _RESEARCH_CACHE[key]
+            QUERY_HITS.pop(key, None)
+            return None
+        _RESEARCH_CACHE.move_to_end(key)
+        QUERY_HITS[key] = QUERY_HITS.get(key, 0) + 1
+        return entry[2]
+
+
+def _store_research(key: str, context: str):
+    with _RESEARCH_LOCK:
+        _RESEARCH_CACHE[key] = (time.monotonic(), research_cache_ttl(key), context)
+        _RESEARCH_CACHE.move_to_end(key)
+        while len(_RESEARCH_CACHE) > RESEARCH_CACHE_MAX_ENTRIES:
+            evicted, _ = _RESEARCH_CACHE.popitem(last=False)
+            QUERY_HITS.pop(evicted, None)
+
+
 class BaseAgent(ABC):
     def __init__(self, name: str, model_name: str, archetype: str):
         self.name = name
         self.model_name = model_name
         self.archetype = archetype
         tavily_key = os.getenv("TAVILY_API_KEY")
-        self.tavily = TavilyClient(api_key=tavily_key) if tavily_key else None
+        self.tavily = None
+        if tavily_key:
+            from tavily import TavilyClient
+            self.tavily = TavilyClient(api_key=tavily_key)
 
     def research(self, query: str) -> str:
         """
@@ -18,11 +65,19 @@ class BaseAgent(ABC):
         """
         if not self.tavily:
             return "Research skipped: TAVILY_API_KEY not provided."
+        
+        cache_key = query.strip().lower()
+        cached = _cached_research(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.tavily.search(query=query, search_depth="advanced")
-            context = ""
-            for result in response.get("results", []):
-                context += f"Source: {result['url']}\nContent: {result['content']}\n\n"
+            context = "".join(
+                "Source: %s\nContent: %s\n\n" % (result.get("url", "N/A"), result.get("content") or "")
+                for result in response.get("results", [])
+            )
+            _store_research(cache_key, context)
             return context
         except Exception as e:
             return f"Research failed: {e}"
@@ -4,8 +4,6 @@ Uses Gemini or OpenAI depending on available API keys.
 """
 
 import os
-import google.generativeai as genai
-from openai import OpenAI
 from src.prompts import MODERATOR_SYSTEM_PROMPT
 
 
@@ -23,6 +21,7 @@ class ModeratorAgent:
         # Check OpenAI first
         openai_key = os.getenv("OPENAI_API_KEY")
         if openai_key and len(openai_key) > 20 and not openai_key.startswith("your_"):
+            from openai import OpenAI
             self._provider = "openai"
             self._client = OpenAI(api_key=openai_key)
             return
@@ -30,6 +29,7 @@ class ModeratorAgent:
         # Check Gemini
         gemini_key = os.getenv("GEMINI_API_KEY")
         if gemini_key and len(gemini_key) > 20 and not gemini_key.startswith("your_"):
+            import google.generativeai as genai
             self._provider = "gemini"
             genai.configure(api_key=gemini_key)
             self._gemini_model = genai.GenerativeModel("gemini-2.0-flash")
@@ -1,5 +1,6 @@
 import os
-import json
+from abc import abstractmethod
+from typing import Tuple
 from src.agents.base_agent import BaseAgent
 from src.models import PredictionOutput, EventMetadata
 from src.prompts import SYSTEM_PROMPT_PREFIX, CHATGPT_ARCHETYPE, GROK_ARCHETYPE, GEMINI_ARCHETYPE, PREDICTION_PROMPT
@@ -7,17 +8,30 @@ from src.utils.api_adapter import UnifiedLLM
 from src.utils.console import console
 
 
-def clean_json(content: str) -> str:
-    if not content:
-        return "{}"
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0].strip()
-    elif "```" in content:
-        content = content.split("```")[1].split("```")[0].strip()
-    return content
+class LLMAgent(BaseAgent):
+    """Shared sync/async prediction flow; subclasses supply the prompts."""
 
+    @abstractmethod
+    def _prompts(self, event: EventMetadata) -> Tuple[str, str]:
+        pass
 
-class ChatGPTAgent(BaseAgent):
+    def generate_prediction(self, event: EventMetadata) -> PredictionOutput:
+        console.print(f"   [dim]Analyzing event...[/dim]")
+        system, user = self._prompts(event)
+        return self._checked(self._llm.generate_json_obj(user, system, schema=PredictionOutput))
+
+    async def agenerate_prediction(self, event: EventMetadata) -> PredictionOutput:
+        console.print(f"   [dim]Analyzing event...[/dim]")
+        system, user = self._prompts(event)
+        return self._checked(await self._llm.agenerate_json_obj(user, system, schema=PredictionOutput))
+
+    def _checked(self, prediction) -> PredictionOutput:
+        if prediction is None:
+            raise self._llm.last_error or Exception("API returned no response")
+        return prediction
+
+
+class ChatGPTAgent(LLMAgent):
 
     def __init__(self):
         self._api_key = (
@@ -37,9 +51,7 @@ class ChatGPTAgent(BaseAgent):
     def has_valid_config(self) -> bool:
         return self._llm is not None and self._llm.is_valid()
 
-    def generate_prediction(self, event: EventMetadata) -> PredictionOutput:
-        console.print(f"   [dim]Analyzing event...[/dim]")
-        
+    def _prompts(self, event: EventMetadata) -> Tuple[str, str]:
         system = f"""{SYSTEM_PROMPT_PREFIX}
 {CHATGPT_ARCHETYPE}
 
@@ -54,15 +66,10 @@ Analyze this prediction market event using your knowledge. Be precise and data-d
             event_id=event.event_id
         )
         
-        response = self._llm.generate_json(user, system)
-        if not response:
-            raise Exception("API returned no response")
-        
-        data = json.loads(clean_json(response))
-        return PredictionOutput(**data)
+        return system, user
 
 
-class GrokAgent(BaseAgent):
+class GrokAgent(LLMAgent):
 
     def __init__(self):
         self._api_key = (
@@ -82,9 +89,7 @@ class GrokAgent(BaseAgent):
     def has_valid_config(self) -> bool:
         return self._llm is not None and self._llm.is_valid()
 
-    def generate_prediction(self, event: EventMetadata) -> PredictionOutput:
-        console.print(f"   [dim]Analyzing event...[/dim]")
-        
+    def _prompts(self, event: EventMetadata) -> Tuple[str, str]:
         system = f"""{SYSTEM_PROMPT_PREFIX}
 {GROK_ARCHETYPE}
 
@@ -99,15 +104,10 @@ Analyze this prediction market event. Look for early signals and unconventional
             event_id=event.event_id
         )
         
-        response = self._llm.generate_json(user, system)
-        if not response:
-            raise Exception("API returned no response")
-        
-        data = json.loads(clean_json(response))
-        return PredictionOutput(**data)
+        return system, user
 
 
-class GeminiAgent(BaseAgent):
+class GeminiAgent(LLMAgent):
 
     def __init__(self):
         self._api_key = (
@@ -126,9 +126,7 @@ class GeminiAgent(BaseAgent):
     def has_valid_config(self) -> bool:
         return self._llm is not None and self._llm.is_valid()
 
-    def generate_prediction(self, event: EventMetadata) -> PredictionOutput:
-        console.print(f"   [dim]Analyzing event...[/dim]")
-        
+    def _prompts(self, event: EventMetadata) -> Tuple[str, str]:
         system = f"""{SYSTEM_PROMPT_PREFIX}
 {GEMINI_ARCHETYPE}
 
@@ -143,9 +141,4 @@ Analyze this prediction market event. Focus on constraints, feasibility, and his
             event_id=event.event_id
         )
         
-        response = self._llm.generate_json(user, system)
-        if not response:
-            raise Exception("API returned no response")
-        
-        data = json.loads(clean_json(response))
-        return PredictionOutput(**data)
+        return system, user
@@ -7,7 +7,7 @@ from src.utils.console import (
     console, print_header, print_section, print_predictions_table,
     print_error, print_moderator
 )
-from src.utils.api_adapter import UnifiedLLM
+from src.utils.api_adapter import FallbackLLM
 from rich.panel import Panel
 
 AGENT_PERSONAS = {
@@ -34,13 +34,11 @@ class DebateService:
         self._setup_llm()
     
     def _setup_llm(self):
-        for key_name in ["GEMINI_API_KEY", "GEMINI_KEY", "CHATGPT_KEY", "GROK_KEY", "OPENAI_API_KEY"]:
-            key = os.getenv(key_name)
-            if key and len(key) > 20:
-                self._llm = UnifiedLLM(key, "Debate", console)
-                if self._llm.is_valid():
-                    return
-        self._llm = None
+        # Every configured key becomes a backend; later ones take over when one fails
+        keys = [os.getenv(key_name) for key_name in ["GEMINI_API_KEY", "GEMINI_KEY", "CHATGPT_KEY", "GROK_KEY", "OPENAI_API_KEY"]]
+        keys = list(dict.fromkeys(key for key in keys if key and len(key) > 20))
+        llm = FallbackLLM(keys, "Debate", console, cache_enabled=False)
+        self._llm = llm if llm.is_valid() else None
     
     def _generate(self, prompt: str, agent_name: str) -> str:
         if not self._llm:
@@ -60,14 +58,12 @@ YOUR OPTIONS:
 Be natural like a human expert."""
         
         for attempt in range(3):
-            try:
-                result = self._llm.generate(prompt, system)
-                if result and len(result) > 2:
-                    return result
-            except Exception as e:
-                if "429" in str(e):
-                    time.sleep(5)
-                time.sleep(2)
+            result = self._llm.generate(prompt, system)
+            if result and len(result) > 2:
+                return result
+            # The adapter already retried and failed over; only a too-short reply is worth asking again
+            if self._llm.last_error is not None:
+                return None
         return None
 
     def _show_thinking(self, agent_name: str):
@@ -1,7 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, List
 from src.models import EventMetadata
 
+# Shared keep-alive session so repeated Gamma API calls reuse TCP/TLS connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+_SESSION.headers.update({"Connection": "keep-alive"})
+
 class PolymarketService:
     BASE_URL = "https://gamma-api.polymarket.com"
 
@@ -24,7 +35,7 @@ class PolymarketService:
                 # If it's a slug, we need to query the events list by slug
                 url = f"{cls.BASE_URL}/events?slug={input_identifier}"
             
-            response = requests.get(url)
+            response = _SESSION.get(url)
             if response.status_code != 200:
                 print(f"Error fetching event: {response.status_code}")
                 return None
@@ -70,7 +81,7 @@ class PolymarketService:
                 "order": "liquidity",
                 "ascending": "false"
             }
-            response = requests.get(cls.BASE_URL + "/events", params=params)
+            response = _SESSION.get(cls.BASE_URL + "/events", params=params)
             if response.status_code != 200:
                 return []
             
@@ -4,11 +4,14 @@ Returns both predictions list and agent_predictions dict for debate
 """
 
 import os
+import asyncio
 from typing import List, Tuple, Dict
 from src.agents.specialized_agents import ChatGPTAgent, GrokAgent, GeminiAgent
 from src.services.polymarket_service import PolymarketService
 from src.database import Database
 from src.models import PredictionOutput
+from src.utils.api_adapter import is_rate_limit_error, close_async_clients
+from src.utils.event_loop import new_event_loop
 from src.utils.console import (
     console, print_header, print_event, print_agents_status,
     print_prediction, print_predictions_table, print_error, print_section
@@ -36,15 +39,25 @@ class PredictionService:
                 inactive.append(agent.name)
         return active, inactive
 
-    def _format_error(self, error: str) -> str:
+    def _format_error(self, error: Exception) -> str:
         """Clean up error messages."""
-        if "429" in str(error) or "quota" in str(error).lower():
+        if is_rate_limit_error(error):
             return "Rate limit exceeded. Wait 1 minute."
-        if "401" in str(error) or "unauthorized" in str(error).lower() or "invalid" in str(error).lower():
+        message = str(error)
+        if "401" in message or "unauthorized" in message.lower() or "invalid" in message.lower():
             return "Invalid API key."
-        if "404" in str(error) or "not found" in str(error).lower():
+        if "404" in message or "not found" in message.lower():
             return "Model not found."
-        return str(error).split('\n')[0][:80]
+        return message.split('\n')[0][:80]
+
+    async def _gather_predictions(self, agents, event) -> List:
+        try:
+            return await asyncio.gather(
+                *(agent.agenerate_prediction(event) for agent in agents),
+                return_exceptions=True
+            )
+        finally:
+            await close_async_clients()
 
     def run_battle(self, event_id: str):
         """Returns (predictions_list, agent_predictions_dict) for debate."""
@@ -74,14 +87,27 @@ class PredictionService:
             return [], {}
 
         # 3. Run Predictions - Track with agent names
+        print_section("Agents Researching")
         predictions: List[PredictionOutput] = []
         agent_predictions: List[Dict] = []  # For debate
         
-        for agent in active_agents:
-            print_section(f"{agent.name} Researching")
+        # Agents are independent, so wall time is the slowest agent rather than the sum
+        loop = new_event_loop()
+        try:
+            results = loop.run_until_complete(self._gather_predictions(active_agents, event))
+        finally:
+            # Same teardown as asyncio.run: agents' to_thread calls use the default executor
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+        
+        for agent, result in zip(active_agents, results):
+            print_section(f"{agent.name} Prediction")
             
             try:
-                pred = agent.generate_prediction(event)
+                if isinstance(result, Exception):
+                    raise result
+                
+                pred = result
                 self.db.save_prediction(agent.name, pred)
                 predictions.append(pred)
                 
@@ -104,7 +130,7 @@ class PredictionService:
                 )
                     
             except Exception as e:
-                print_error(f"{agent.name} failed: {self._format_error(str(e))}")
+                print_error(f"{agent.name} failed: {self._format_error(e)}")
 
         # Summary table
         if agent_predictions:
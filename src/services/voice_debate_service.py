@@ -1,13 +1,14 @@
 import os
 import time
 import random
+from itertools import chain
 from typing import List, Dict
 from src.database import Database
-from src.utils.voice import speak
+from src.utils.voice import speak, speak_sequence, split_sentences
 from src.utils.console import (
     console, print_header, print_section, print_predictions_table, print_error
 )
-from src.utils.api_adapter import UnifiedLLM
+from src.utils.api_adapter import FallbackLLM
 from rich.panel import Panel
 
 AGENT_PERSONAS = {
@@ -34,32 +35,47 @@ class VoiceDebateService:
         self._setup_llm()
     
     def _setup_llm(self):
-        for key_name in ["GEMINI_KEY", "CHATGPT_KEY", "GROK_KEY", "GEMINI_API_KEY", "OPENAI_API_KEY"]:
-            key = os.getenv(key_name)
-            if key and len(key) > 20:
-                self._llm = UnifiedLLM(key, "VoiceDebate", console)
-                if self._llm.is_valid():
-                    return
-        self._llm = None
+        # Every configured key becomes a backend; later ones take over when one fails
+        keys = [os.getenv(key_name) for key_name in ["GEMINI_KEY", "CHATGPT_KEY", "GROK_KEY", "GEMINI_API_KEY", "OPENAI_API_KEY"]]
+        keys = list(dict.fromkeys(key for key in keys if key and len(key) > 20))
+        llm = FallbackLLM(keys, "VoiceDebate", console, cache_enabled=False)
+        self._llm = llm if llm.is_valid() else None
     
+    def _system(self, agent_name):
+        persona = AGENT_PERSONAS.get(agent_name, "")
+        return persona + "\n\nYou are in a LIVE voice debate. YOU DECIDE whether to speak, PASS, or say I've made my point."
+
     def _generate(self, prompt, agent_name):
         if not self._llm:
             return None
         
-        persona = AGENT_PERSONAS.get(agent_name, "")
-        system = persona + "\n\nYou are in a LIVE voice debate. YOU DECIDE whether to speak, PASS, or say I've made my point."
-        
+        system = self._system(agent_name)
         for attempt in range(3):
-            try:
-                result = self._llm.generate(prompt, system)
-                if result and len(result) > 2:
-                    return result
-            except Exception as e:
-                if "429" in str(e):
-                    time.sleep(5)
-                time.sleep(2)
+            result = self._llm.generate(prompt, system)
+            if result and len(result) > 2:
+                return result
+            # The adapter already retried and failed over; only a too-short reply is worth asking again
+            if self._llm.last_error is not None:
+                return None
         return None
 
+    def _choose_opener(self, event_title, predictions):
+        if not self._llm:
+            return None
+        
+        names = [p['agent_name'] for p in predictions]
+        panel = "\n\n".join(p['agent_name'] + " (predicted " + p['prediction'] + "):\n" + AGENT_PERSONAS.get(p['agent_name'], "") for p in predictions)
+        system = "You moderate a LIVE voice debate and pick which panelist opens, in their own style.\n\nPANELISTS:\n" + panel
+        prompt = "Event: " + event_title + "\nReturn a JSON object with \"speaker\" (one of: " + ", ".join(names) + ") and \"line\" (that panelist's opening line)."
+        
+        choice = self._llm.generate_json_obj(prompt, system)
+        if not isinstance(choice, dict):
+            return None
+        speaker, line = choice.get("speaker"), choice.get("line")
+        if speaker not in names or not isinstance(line, str) or not line.strip():
+            return None
+        return speaker, line
+
     def _show_thinking(self, agent_name):
         console.print(f"\n   [dim]{agent_name} considering...[/dim]", end="")
         time.sleep(0.3)
@@ -72,6 +88,39 @@ class VoiceDebateService:
         speak(text, name)
         time.sleep(0.3)
 
+    def _stream_turn(self, name, prompt, prediction):
+        """
+        Speak a turn sentence by sentence while it is still streaming in,
+        so audio starts after the first sentence instead of the whole reply.
+        Returns the full text; a PASS is returned without being spoken.
+        """
+        if not self._llm:
+            return None
+        
+        sentences = split_sentences(self._llm.generate_stream(prompt, self._system(name)))
+        first = next(sentences, None)
+        if first is None:
+            # Nothing streamed (e.g. every backend rate limited): the retrying path takes over
+            response = self._generate(prompt, name)
+            if response and response.strip().upper() != "PASS":
+                self._speak_agent(name, response, prediction)
+            return response
+        if first.upper() == "PASS":
+            return first
+        
+        color = "green" if prediction == "YES" else "red"
+        console.print(f"\n   [bold {color}]{name}[/bold {color}] [dim]({prediction})[/dim]")
+        spoken = []
+        
+        def _on_start(_, text):
+            spoken.append(text)
+            console.print(f"      [white]{text}[/white]")
+        
+        # Streamed sentences are one-offs, so they skip the TTS disk cache
+        speak_sequence(((sentence, name) for sentence in chain([first], sentences)), on_start=_on_start, cache=False)
+        time.sleep(0.3)
+        return " ".join(spoken)
+
     def run_voice_debate(self, event_id, predictions, rounds=3):
         if len(predictions) < 2:
             print_error("Need at least 2 predictions.")
@@ -106,10 +155,18 @@ class VoiceDebateService:
         shuffled = predictions.copy()
         random.shuffle(shuffled)
         
+        # One request picks the opener and its line; fall back to asking agents one by one
+        opener = self._choose_opener(event_title, shuffled)
+        
         for p in shuffled:
+            if opener is not None and p['agent_name'] != opener[0]:
+                continue
             self._show_thinking(p['agent_name'])
-            prompt = "Event: " + event_title + "\nYour prediction: " + p['prediction'] + "\nDo you want to start? Or PASS."
-            response = self._generate(prompt, p['agent_name'])
+            if opener is not None:
+                response = opener[1]
+            else:
+                prompt = "Event: " + event_title + "\nYour prediction: " + p['prediction'] + "\nDo you want to start? Or PASS."
+                response = self._generate(prompt, p['agent_name'])
             if response and response.strip().upper() != "PASS":
                 self._speak_agent(p['agent_name'], response, p['prediction'])
                 transcript.append({"speaker": p['agent_name'], "text": response})
@@ -131,19 +188,16 @@ class VoiceDebateService:
                 
                 prompt = "Event: " + event_title + "\nYour prediction: " + current['prediction'] + "\n\nCONVERSATION:\n" + recent + "\n\nDo you want to respond, PASS, or say I've made my point?"
 
-                response = self._generate(prompt, current['agent_name'])
+                response = self._stream_turn(current['agent_name'], prompt, current['prediction'])
                 
                 if response:
                     clean = response.strip()
                     if clean.upper() == "PASS":
                         console.print(f"   [dim]{current['agent_name']} passes.[/dim]")
-                    elif "made my point" in clean.lower():
-                        self._speak_agent(current['agent_name'], clean, current['prediction'])
-                        conversation.append(current['agent_name'] + ": " + clean)
-                        agents_done.add(current['agent_name'])
                     else:
-                        self._speak_agent(current['agent_name'], clean, current['prediction'])
                         conversation.append(current['agent_name'] + ": " + clean)
+                        if "made my point" in clean.lower():
+                            agents_done.add(current['agent_name'])
         
         closing = "All agents concluded."
         console.print(f"\n[magenta]Moderator:[/magenta] {closing}")
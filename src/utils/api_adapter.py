@@ -1,9 +1,15 @@
 import os
-import json
-from typing import Optional, Tuple, Dict, List, Callable
-from openai import OpenAI
-from google import genai
-from google.genai import types
+import sys
+import random
+import asyncio
+import time
+import hashlib
+import threading
+import orjson
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, List, Callable, Iterator, Any
+from src.utils.llm_cache import LLMCache, DEFAULT_CACHE, EMBEDDING_MODELS
 
 
 API_CONFIGS = {
@@ -11,66 +17,580 @@ API_CONFIGS = {
         "prefix": "gsk_",
         "base_url": "https://api.groq.com/openai/v1",
         "default_model": "llama-3.3-70b-versatile",
-        "has_function_calling": False
+        "has_function_calling": False,
+        "rpm": 30,
+        "tpm": 12000
     },
     "xai": {
         "prefix": "xai-",
         "base_url": "https://api.x.ai/v1",
         "default_model": "grok-2-latest",
-        "has_function_calling": True
+        "has_function_calling": True,
+        "rpm": 60,
+        "tpm": 100000
     },
     "gemini": {
         "prefix": "AIza",
         "base_url": None,
         "default_model": "gemini-2.0-flash",
-        "has_function_calling": True
+        "has_function_calling": True,
+        "rpm": 15,
+        "tpm": 1000000
     },
     "openai": {
         "prefix": "sk-",
         "base_url": None,
         "default_model": "gpt-4o",
-        "has_function_calling": True
+        "has_function_calling": True,
+        "rpm": 500,
+        "tpm": 30000
     }
 }
 
 
+# Providers with native JSON mode and function calling; others fall back to plain generate
+NATIVE_MODE_APIS = ("gemini", "openai", "xai")
+
+# Providers whose OpenAI-compatible endpoint also serves the Files + Batches API
+BATCH_APIS = ("openai",)
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+# A closed JSON object is never followed by blank lines, so stop rather than let the model ramble
+JSON_STOP = ["\n\n\n"]
+
+# Predictions and debate turns stay well under this; 512 can cut off a prediction's rationale and key facts mid-JSON
+DEFAULT_MAX_TOKENS = 1024
+JSON_INSTRUCTION = "\n\nYou must respond with valid JSON."
+
+# Only JSON mode is pinned to temperature 0; plain and tool calls sample, so caching them would freeze one sample
+DETERMINISTIC_MODES = ("json",)
+
+
+class TokenBucket:
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+        self._updated = now
+    
+    def reserve(self, tokens: int = 0) -> float:
+        # Capacity may go negative; the deficit is the wait before the request may be sent
+        with self._lock:
+            self._refill(time.monotonic())
+            self._requests -= 1
+            self._tokens -= min(tokens, self.tpm)
+            return max(-self._requests * 60 / self.rpm, -self._tokens * 60 / self.tpm, 0.0)
+    
+    def acquire(self, tokens: int = 0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def drain(self):
+        with self._lock:
+            self._updated = time.monotonic()
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, 0.0)
+
+
+# (api_type, model) -> bucket shared by every client of that model, sync and async alike
+_BUCKETS: Dict[Tuple[str, str], TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(api_type: str, model: str) -> TokenBucket:
+    # Limits default to the free tiers; GROQ_RPM, OPENAI_TPM etc. override them for paid accounts
+    with _BUCKETS_LOCK:
+        key = (api_type, model)
+        if key not in _BUCKETS:
+            config = API_CONFIGS[api_type]
+            prefix = api_type.upper()
+            rpm = int(os.getenv(f"{prefix}_RPM") or config["rpm"])
+            tpm = int(os.getenv(f"{prefix}_TPM") or config["tpm"])
+            _BUCKETS[key] = TokenBucket(rpm, tpm)
+        return _BUCKETS[key]
+
+
+def estimate_tokens(*texts: str) -> int:
+    return sum(len(text) for text in texts if text) // 4
+
+
+# (api_type, sha256 of api key) -> OpenAI / genai.Client, shared across agents
+_CLIENT_POOL: Dict[Tuple[str, str], object] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+HTTP_MAX_CONNECTIONS = 64
+HTTP_KEEPALIVE_EXPIRY = 300
+
+# (base_url, event loop) -> httpx.AsyncClient shared by every AsyncOpenAI on that loop
+_HTTP_CLIENTS: Dict[Tuple[Optional[str], object], object] = {}
+
+
+def get_async_http_client(base_url: Optional[str]):
+    # Async connection pools are bound to the loop that opened them
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _HTTP_CLIENTS if key[1].is_closed()]:
+        del _HTTP_CLIENTS[key]
+    
+    key = (base_url, loop)
+    if key not in _HTTP_CLIENTS:
+        import httpx
+        from openai import DefaultAsyncHttpxClient
+        try:
+            import h2  # noqa: F401 - httpx needs it for HTTP/2
+            http2 = True
+        except ImportError:
+            http2 = False
+        _HTTP_CLIENTS[key] = DefaultAsyncHttpxClient(
+            http2=http2,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+        )
+    return _HTTP_CLIENTS[key]
+
+
+# (sha256 of api key, event loop) -> genai.Client whose .aio side is used on that loop only
+_GEMINI_AIO_CLIENTS: Dict[Tuple[str, object], object] = {}
+
+
+def get_gemini_aio_client(api_key: str):
+    # The pooled sync genai.Client is shared across threads and loops, so its aio pool can't be
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _GEMINI_AIO_CLIENTS if key[1].is_closed()]:
+        del _GEMINI_AIO_CLIENTS[key]
+    
+    key = (hashlib.sha256(api_key.encode()).hexdigest(), loop)
+    if key not in _GEMINI_AIO_CLIENTS:
+        from google import genai
+        _GEMINI_AIO_CLIENTS[key] = genai.Client(api_key=api_key)
+    return _GEMINI_AIO_CLIENTS[key].aio
+
+
+async def close_async_clients():
+    # Await before the loop shuts down (e.g. at the end of asyncio.run's coroutine);
+    # keep-alive transports left open on a closed loop warn or crash at exit
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _HTTP_CLIENTS if key[1] is loop]:
+        await _HTTP_CLIENTS.pop(key).aclose()
+    for key in [key for key in _GEMINI_AIO_CLIENTS if key[1] is loop]:
+        aio = _GEMINI_AIO_CLIENTS.pop(key).aio
+        # Older google-genai releases have no aclose; their pool dies with the loop
+        if hasattr(aio, "aclose"):
+            await aio.aclose()
+
+
+# cache key -> Future of the request currently on the wire for it
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+# key prefix -> (api_type, model, has_function_calling)
+_PREFIX_MAP = {
+    config["prefix"]: (api_type, config["default_model"], config["has_function_calling"])
+    for api_type, config in API_CONFIGS.items()
+}
+# Longest first, so a longer prefix wins over a shorter one it extends
+_PREFIX_LENGTHS = sorted({len(prefix) for prefix in _PREFIX_MAP}, reverse=True)
+
+
+MAX_RETRIES = 4
+MAX_RETRY_DELAY = 30
+
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    # Honor the server's Retry-After when present, else exponential backoff; always add jitter.
+    # A Retry-After past MAX_RETRY_DELAY (e.g. a quota window) returns None: better to fail
+    # over to the next backend than to block the caller for minutes
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        delay = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        delay = min(2 ** attempt, MAX_RETRY_DELAY)
+    if delay > MAX_RETRY_DELAY:
+        return None
+    return delay + random.random()
+
+
+def clean_json(content: str) -> str:
+    if not content:
+        return "{}"
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    return content
+
+
 def detect_api_type(api_key: str) -> Tuple[str, str, bool]:
     if not api_key or len(api_key) < 10:
         return None, None, False
     
-    for api_type, config in API_CONFIGS.items():
-        if api_key.startswith(config["prefix"]):
-            return api_type, config["default_model"], config["has_function_calling"]
+    for length in _PREFIX_LENGTHS:
+        match = _PREFIX_MAP.get(api_key[:length])
+        if match:
+            return match
     
     return "groq", "llama-3.3-70b-versatile", False
 
 
+# Provider SDKs are imported lazily, so an error can only come from an SDK already in sys.modules
+
+def is_rate_limit_error(error: Optional[Exception]) -> bool:
+    openai = sys.modules.get("openai")
+    if openai and isinstance(error, openai.RateLimitError):
+        return True
+    genai_errors = sys.modules.get("google.genai.errors")
+    return bool(genai_errors) and isinstance(error, genai_errors.APIError) and error.code == 429
+
+
+def is_connection_error(error: Optional[Exception]) -> bool:
+    openai = sys.modules.get("openai")
+    if openai and isinstance(error, (openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    genai_errors = sys.modules.get("google.genai.errors")
+    if genai_errors and isinstance(error, genai_errors.ServerError):
+        return True
+    httpx = sys.modules.get("httpx")
+    return bool(httpx) and isinstance(error, httpx.TransportError)
+
+
+@lru_cache(maxsize=32)
+def gemini_tool_config(tools_json: bytes, max_output_tokens: int):
+    # Keyed by the sorted JSON of the OpenAI-style tools, since the dicts themselves aren't hashable
+    from google.genai import types
+    tools = orjson.loads(tools_json)
+    function_declarations = []
+    for tool in tools:
+        if tool.get("type") == "function":
+            fn = tool["function"]
+            params = fn.get("parameters", {})
+            
+            properties = {}
+            for prop_name, prop_def in params.get("properties", {}).items():
+                prop_type = prop_def.get("type", "string").upper()
+                gemini_type = getattr(types.Type, prop_type, types.Type.STRING)
+                properties[prop_name] = types.Schema(
+                    type=gemini_type,
+                    description=prop_def.get("description", "")
+                )
+            
+            declaration = types.FunctionDeclaration(
+                name=fn["name"],
+                description=fn.get("description", ""),
+                parameters=types.Schema(
+                    type=types.Type.OBJECT,
+                    properties=properties,
+                    required=params.get("required", [])
+                )
+            )
+            function_declarations.append(declaration)
+    
+    gemini_tools = types.Tool(function_declarations=function_declarations)
+    return types.GenerateContentConfig(tools=[gemini_tools], max_output_tokens=max_output_tokens)
+
+
 class UnifiedLLM:
     
-    def __init__(self, api_key: str, agent_name: str = "Agent", console=None):
+    # google.genai.types, loaded with the first Gemini client
+    _types = None
+    
+    def __init__(
+        self,
+        api_key: str,
+        agent_name: str = "Agent",
+        console=None,
+        cache: Optional[LLMCache] = None,
+        cache_enabled: bool = True,
+        cache_modes: Tuple[str, ...] = DETERMINISTIC_MODES,
+        max_concurrent: int = 4,
+        max_tokens: int = DEFAULT_MAX_TOKENS
+    ):
         self.api_key = api_key
         self.agent_name = agent_name
         self.console = console
+        self.cache = cache or DEFAULT_CACHE
+        self.cache_enabled = cache_enabled
+        self.cache_modes = cache_modes
+        self.max_concurrent = max_concurrent
+        self.max_tokens = max_tokens
         self.api_type, self.model, self.has_function_calling = detect_api_type(api_key)
+        self._valid = bool(self.api_key and len(self.api_key) > 20 and self.api_type)
         self._client = None
         self._gemini_client = None
+        self._gemini_config = None
+        self._gemini_json_config = None
+        self._aclient = None
+        self._json_system_cache: Dict[str, str] = {}
+        self._semaphore = None
+        self._async_loop = None
+        self.last_error = None
+        self._bucket = get_rate_limiter(self.api_type, self.model) if self.api_type else None
         
         if self.api_type:
             self._setup_client()
     
     def _setup_client(self):
         if self.api_type == "gemini":
-            self._gemini_client = genai.Client(api_key=self.api_key)
+            if UnifiedLLM._types is None:
+                from google.genai import types
+                UnifiedLLM._types = types
+            self._gemini_config = self._types.GenerateContentConfig(max_output_tokens=self.max_tokens)
+            self._gemini_json_config = self._types.GenerateContentConfig(
+                response_mime_type="application/json",
+                max_output_tokens=self.max_tokens,
+                temperature=0
+            )
+        
+        pool_key = (self.api_type, hashlib.sha256(self.api_key.encode()).hexdigest())
+        with _CLIENT_POOL_LOCK:
+            client = _CLIENT_POOL.get(pool_key)
+            if client is None:
+                client = self._create_client()
+                _CLIENT_POOL[pool_key] = client
+        
+        if self.api_type == "gemini":
+            self._gemini_client = client
         else:
-            config = API_CONFIGS.get(self.api_type, {})
-            base_url = config.get("base_url")
-            if base_url:
-                self._client = OpenAI(api_key=self.api_key, base_url=base_url)
-            else:
-                self._client = OpenAI(api_key=self.api_key)
+            self._client = client
+    
+    def _create_client(self):
+        if self.api_type == "gemini":
+            from google import genai
+            return genai.Client(api_key=self.api_key)
+        
+        from openai import OpenAI
+        config = API_CONFIGS.get(self.api_type, {})
+        base_url = config.get("base_url")
+        # _with_retry owns the retry policy; SDK retries would multiply its attempts
+        if base_url:
+            return OpenAI(api_key=self.api_key, base_url=base_url, max_retries=0)
+        return OpenAI(api_key=self.api_key, max_retries=0)
     
     def is_valid(self) -> bool:
-        return bool(self.api_key and len(self.api_key) > 20 and self.api_type)
+        return self._valid
+    
+    def _report_error(self, label: str, error: Exception):
+        self.last_error = error
+        if self._bucket and is_rate_limit_error(error):
+            self._bucket.drain()
+        if self.console:
+            self.console.print(f"      [dim red]{label}: {str(error)[:80]}[/dim red]")
+    
+    def _openai_params(self, json_mode: bool = False) -> Dict:
+        if not json_mode:
+            return {"max_tokens": self.max_tokens}
+        # temperature 0 makes JSON answers repeatable, which is what the response cache assumes
+        return {
+            "max_tokens": self.max_tokens,
+            "response_format": JSON_RESPONSE_FORMAT,
+            "temperature": 0,
+            "stop": JSON_STOP
+        }
+    
+    def _cache_key(self, mode: str, prompt: str, system_prompt: str, tools: List[Dict] = None) -> str:
+        return LLMCache.make_key({
+            "api": self.api_type,
+            "model": self.model,
+            "sys": system_prompt,
+            "prompt": prompt,
+            "mode": mode,
+            "tools": tools,
+            "max_tokens": self.max_tokens
+        })
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        if not self.cache_enabled:
+            return None
+        return self.cache.get(key)
+    
+    def _cache_set(self, key: str, response: Optional[str]):
+        if self.cache_enabled:
+            self.cache.set(key, response)
+    
+    def _embed(self, text: str) -> Optional[List[float]]:
+        semantic = self.cache.semantic
+        if not (self.cache_enabled and semantic):
+            return None
+        if semantic.embedder:
+            return semantic.embedder(text)
+        if self.api_type not in EMBEDDING_MODELS:
+            return None
+        try:
+            if self.api_type == "gemini":
+                response = self._gemini_client.models.embed_content(
+                    model=EMBEDDING_MODELS["gemini"],
+                    contents=text
+                )
+                return response.embeddings[0].values
+            response = self._client.embeddings.create(model=EMBEDDING_MODELS["openai"], input=text)
+            return response.data[0].embedding
+        except Exception:
+            return None
+    
+    def _semantic_bucket(self, mode: str, system_prompt: str) -> Tuple:
+        return (self.api_type, self.model, mode, hashlib.sha256(system_prompt.encode()).hexdigest())
+    
+    def _semantic_get(self, mode: str, system_prompt: str, embedding: Optional[List[float]]) -> Optional[str]:
+        if embedding is None:
+            return None
+        return self.cache.semantic.lookup(self._semantic_bucket(mode, system_prompt), embedding)
+    
+    def _semantic_set(self, mode: str, system_prompt: str, key: str, embedding: Optional[List[float]], response: Optional[str]):
+        if embedding is not None and response:
+            self.cache.semantic.store(self._semantic_bucket(mode, system_prompt), key, embedding, response)
+    
+    def _cache_lookup(self, mode: str, prompt: str, system_prompt: str, tools: List[Dict] = None):
+        key = self._cache_key(mode, prompt, system_prompt, tools)
+        if mode not in self.cache_modes:
+            return key, None, None
+        cached = self._cache_get(key)
+        if cached is not None or tools:
+            return key, None, cached
+        
+        embedding = self._embed(prompt)
+        return key, embedding, self._semantic_get(mode, system_prompt, embedding)
+    
+    def _cache_store(self, mode: str, system_prompt: str, key: str, embedding: Optional[List[float]], response: Optional[str]):
+        if mode not in self.cache_modes:
+            return
+        self._cache_set(key, response)
+        self._semantic_set(mode, system_prompt, key, embedding, response)
+    
+    def _with_retry(self, call: Callable[[], Optional[str]]) -> Optional[str]:
+        # Only wraps plain and JSON generations: re-sending them has no side effects,
+        # whereas a tool-calling flow would run its tools again
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return call()
+            except Exception as e:
+                if attempt == MAX_RETRIES or not (is_rate_limit_error(e) or is_connection_error(e)):
+                    raise
+                delay = retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                if is_rate_limit_error(e):
+                    self._bucket.drain()
+                time.sleep(delay)
+    
+    async def _awith_retry(self, call: Callable[[], Any]) -> Optional[str]:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return await call()
+            except Exception as e:
+                if attempt == MAX_RETRIES or not (is_rate_limit_error(e) or is_connection_error(e)):
+                    raise
+                delay = retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                if is_rate_limit_error(e):
+                    self._bucket.drain()
+                await asyncio.sleep(delay)
+    
+    def _single_flight(self, key: str, call: Callable[[], Optional[str]]) -> Optional[str]:
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                _INFLIGHT[key] = future
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+    
+    async def _asingle_flight(self, key: str, call: Callable[[], Any]) -> Optional[str]:
+        # Shares _INFLIGHT with the sync path, so async callers also coalesce with threads
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                _INFLIGHT[key] = future
+        
+        if not leader:
+            return await asyncio.wrap_future(future)
+        
+        try:
+            result = await call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+    
+    def _json_system_prompt(self, system_prompt: str) -> str:
+        # json_object mode rejects requests that never mention JSON. Agents reuse one
+        # system prompt per instance, so memoize the amended text; keeping it byte-stable
+        # across calls also lets the provider's prefix cache hit.
+        amended = self._json_system_cache.get(system_prompt)
+        if amended is None:
+            amended = system_prompt if "json" in system_prompt.lower() else system_prompt + JSON_INSTRUCTION
+            self._json_system_cache[system_prompt] = amended
+        return amended
+    
+    def _build_messages(self, prompt: str, system_prompt: str) -> List[Dict]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    @staticmethod
+    def _gemini_prompt(prompt: str, system_prompt: str) -> str:
+        return f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+    
+    @staticmethod
+    def _tool_messages(tool_calls, results: List) -> List[Dict]:
+        return [
+            {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": result if isinstance(result, str) else orjson.dumps(result, default=str).decode()
+            }
+            for tool_call, result in zip(tool_calls, results)
+        ]
+    
+    def _run_tools(self, calls: List[Tuple[str, Dict]], tool_executor: Callable[[str, Dict], str]) -> List:
+        if self.console:
+            for function_name, function_args in calls:
+                self.console.print(f"      [cyan]Tool call:[/cyan] {function_name}({function_args})")
+        
+        # Parallel tool calls from one model turn are independent; run them side by side
+        if len(calls) == 1:
+            results = [tool_executor(*calls[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+                results = list(executor.map(lambda call: tool_executor(*call), calls))
+        
+        if self.console:
+            for result in results:
+                self.console.print(f"      [green]Tool result:[/green] {str(result)[:50]}...")
+        return results
     
     def get_info(self) -> str:
         api_names = {"groq": "Groq", "openai": "OpenAI", "xai": "xAI", "gemini": "Gemini"}
@@ -87,20 +607,25 @@ class UnifiedLLM:
         if not self.is_valid():
             return None
         
-        if not tools:
+        if not tools or self.api_type not in NATIVE_MODE_APIS:
             return self.generate(prompt, system_prompt)
         
+        key, _, cached = self._cache_lookup("tools", prompt, system_prompt, tools)
+        if cached is not None:
+            return cached
+        
+        self.last_error = None
         try:
             if self.api_type == "gemini":
-                return self._gemini_function_call(prompt, system_prompt, tools, tool_executor)
-            elif self.api_type in ["openai", "xai"]:
-                return self._openai_function_call(prompt, system_prompt, tools, tool_executor)
+                response = self._gemini_function_call(prompt, system_prompt, tools, tool_executor)
             else:
-                return self.generate(prompt, system_prompt)
+                response = self._openai_function_call(prompt, system_prompt, tools, tool_executor)
         except Exception as e:
-            if self.console:
-                self.console.print(f"      [dim red]Tool Error: {str(e)[:80]}[/dim red]")
+            self._report_error("Tool Error", e)
             return None
+        
+        self._cache_store("tools", system_prompt, key, None, response)
+        return response
     
     def _openai_function_call(
         self, 
@@ -109,48 +634,50 @@ class UnifiedLLM:
         tools: List[Dict],
         tool_executor: Callable[[str, Dict], str] = None
     ) -> Optional[str]:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        messages, answer = self._openai_tool_round(prompt, system_prompt, tools, tool_executor)
+        if messages is None:
+            return answer
+        
+        final_response = self._client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **self._openai_params()
+        )
+        return final_response.choices[0].message.content.strip()
+    
+    def _openai_tool_round(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        tools: List[Dict],
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        # Returns (follow-up messages, None) after running tools, else (None, direct answer).
+        # Rate-limit capacity for the follow-up request is reserved before returning.
+        messages = self._build_messages(prompt, system_prompt)
         
+        self._bucket.acquire(estimate_tokens(prompt, system_prompt))
         response = self._client.chat.completions.create(
             model=self.model,
             messages=messages,
             tools=tools,
-            tool_choice="auto"
+            tool_choice="auto",
+            **self._openai_params()
         )
         
         message = response.choices[0].message
         
         if message.tool_calls and tool_executor:
-            messages.append(message)
+            messages.append(message.model_dump(exclude_none=True))
             
-            for tool_call in message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                if self.console:
-                    self.console.print(f"      [cyan]Tool call:[/cyan] {function_name}({function_args})")
-                
-                result = tool_executor(function_name, function_args)
-                
-                if self.console:
-                    self.console.print(f"      [green]Tool result:[/green] {str(result)[:50]}...")
-                
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": str(result)
-                })
+            calls = [(tc.function.name, orjson.loads(tc.function.arguments)) for tc in message.tool_calls]
+            results = self._run_tools(calls, tool_executor)
+            messages.extend(self._tool_messages(message.tool_calls, results))
             
-            final_response = self._client.chat.completions.create(
-                model=self.model,
-                messages=messages
-            )
-            return final_response.choices[0].message.content.strip()
+            self._bucket.acquire(estimate_tokens(prompt, system_prompt, *map(str, results)))
+            return messages, None
         
-        return message.content.strip() if message.content else None
+        return None, message.content.strip() if message.content else None
     
     def _gemini_function_call(
         self, 
@@ -159,114 +686,118 @@ class UnifiedLLM:
         tools: List[Dict],
         tool_executor: Callable[[str, Dict], str] = None
     ) -> Optional[str]:
-        function_declarations = []
-        for tool in tools:
-            if tool.get("type") == "function":
-                fn = tool["function"]
-                params = fn.get("parameters", {})
-                
-                properties = {}
-                for prop_name, prop_def in params.get("properties", {}).items():
-                    prop_type = prop_def.get("type", "string").upper()
-                    gemini_type = getattr(types.Type, prop_type, types.Type.STRING)
-                    properties[prop_name] = types.Schema(
-                        type=gemini_type,
-                        description=prop_def.get("description", "")
-                    )
-                
-                declaration = types.FunctionDeclaration(
-                    name=fn["name"],
-                    description=fn.get("description", ""),
-                    parameters=types.Schema(
-                        type=types.Type.OBJECT,
-                        properties=properties,
-                        required=params.get("required", [])
-                    )
-                )
-                function_declarations.append(declaration)
+        contents, config, answer = self._gemini_tool_round(prompt, system_prompt, tools, tool_executor)
+        if contents is None:
+            return answer
         
-        gemini_tools = types.Tool(function_declarations=function_declarations)
-        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        final_response = self._gemini_client.models.generate_content(
+            model=self.model,
+            contents=contents,
+            config=config
+        )
+        return final_response.text.strip()
+    
+    def _gemini_tool_round(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        tools: List[Dict],
+        tool_executor: Callable[[str, Dict], str] = None
+    ):
+        # Returns (follow-up contents, config, None) after running tools, else (None, None, direct answer).
+        # Rate-limit capacity for the follow-up request is reserved before returning.
+        types = self._types
+        config = gemini_tool_config(orjson.dumps(tools, option=orjson.OPT_SORT_KEYS), self.max_tokens)
+        if system_prompt:
+            config = config.model_copy(update={"system_instruction": system_prompt})
+        # Built once and replayed as the first turn of the follow-up request
+        user_turn = types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
         
+        self._bucket.acquire(estimate_tokens(prompt, system_prompt))
         response = self._gemini_client.models.generate_content(
             model=self.model,
-            contents=full_prompt,
-            config=types.GenerateContentConfig(tools=[gemini_tools])
+            contents=[user_turn],
+            config=config
         )
         
-        if response.candidates and response.candidates[0].content.parts:
-            for part in response.candidates[0].content.parts:
-                if hasattr(part, 'function_call') and part.function_call and tool_executor:
-                    fc = part.function_call
-                    function_name = fc.name
-                    function_args = dict(fc.args) if fc.args else {}
-                    
-                    if self.console:
-                        self.console.print(f"      [cyan]Tool call:[/cyan] {function_name}({function_args})")
-                    
-                    result = tool_executor(function_name, function_args)
-                    
-                    if self.console:
-                        self.console.print(f"      [green]Tool result:[/green] {str(result)[:50]}...")
-                    
-                    function_response = types.Part.from_function_response(
-                        name=function_name,
-                        response={"result": result}
-                    )
-                    
-                    contents = [
-                        types.Content(role="user", parts=[types.Part.from_text(full_prompt)]),
-                        types.Content(role="model", parts=[part]),
-                        types.Content(role="user", parts=[function_response])
-                    ]
-                    
-                    final_response = self._gemini_client.models.generate_content(
-                        model=self.model,
-                        contents=contents,
-                        config=types.GenerateContentConfig(tools=[gemini_tools])
-                    )
-                    return final_response.text.strip()
+        content = response.candidates[0].content if response.candidates else None
+        parts = content.parts if content and content.parts else []
+        function_calls = [part.function_call for part in parts if getattr(part, 'function_call', None)]
+        
+        if function_calls and tool_executor:
+            calls = [(fc.name, dict(fc.args) if fc.args else {}) for fc in function_calls]
+            results = self._run_tools(calls, tool_executor)
+            
+            function_responses = [
+                types.Part.from_function_response(name=function_name, response={"result": result})
+                for (function_name, _), result in zip(calls, results)
+            ]
+            contents = [user_turn, content, types.Content(role="user", parts=function_responses)]
+            
+            self._bucket.acquire(estimate_tokens(prompt, system_prompt, *map(str, results)))
+            return contents, config, None
         
-        return response.text.strip() if hasattr(response, 'text') else None
+        return None, None, response.text.strip() if hasattr(response, 'text') else None
     
     def generate_json(self, prompt: str, system_prompt: str = "") -> Optional[str]:
         if not self.is_valid():
             return None
         
+        if self.api_type not in NATIVE_MODE_APIS:
+            return self.generate(prompt, system_prompt)
+        
+        key, embedding, cached = self._cache_lookup("json", prompt, system_prompt)
+        if cached is not None:
+            return cached
+        
+        self.last_error = None
         try:
-            if self.api_type == "gemini":
-                return self._gemini_json(prompt, system_prompt)
-            elif self.api_type in ["openai", "xai"]:
-                return self._openai_json(prompt, system_prompt)
-            else:
-                return self.generate(prompt, system_prompt)
+            call = self._gemini_json if self.api_type == "gemini" else self._openai_json
+            response = self._single_flight(key, lambda: self._with_retry(lambda: call(prompt, system_prompt)))
         except Exception as e:
-            if self.console:
-                self.console.print(f"      [dim red]JSON Error: {str(e)[:80]}[/dim red]")
+            self._report_error("JSON Error", e)
+            return None
+        
+        self._cache_store("json", system_prompt, key, embedding, response)
+        return response
+    
+    def generate_json_obj(self, prompt: str, system_prompt: str = "", schema=None) -> Optional[Any]:
+        return self._parse_json_obj(self.generate_json(prompt, system_prompt), schema)
+    
+    def _parse_json_obj(self, response: Optional[str], schema=None) -> Optional[Any]:
+        if not response:
+            return None
+        
+        try:
+            try:
+                data = orjson.loads(response)
+            except orjson.JSONDecodeError:
+                # Providers without JSON mode may wrap the object in a markdown fence
+                data = orjson.loads(clean_json(response))
+            return schema(**data) if schema else data
+        except Exception as e:
+            self._report_error("JSON Error", e)
             return None
     
     def _openai_json(self, prompt: str, system_prompt: str = "") -> Optional[str]:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        system_prompt = self._json_system_prompt(system_prompt)
         
+        self._bucket.acquire(estimate_tokens(prompt, system_prompt))
         response = self._client.chat.completions.create(
             model=self.model,
-            messages=messages,
-            response_format={"type": "json_object"}
+            messages=self._build_messages(prompt, system_prompt),
+            **self._openai_params(json_mode=True)
         )
         return response.choices[0].message.content.strip()
     
     def _gemini_json(self, prompt: str, system_prompt: str = "") -> Optional[str]:
-        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        full_prompt = self._gemini_prompt(prompt, system_prompt)
         
+        self._bucket.acquire(estimate_tokens(full_prompt))
         response = self._gemini_client.models.generate_content(
             model=self.model,
             contents=full_prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json"
-            )
+            config=self._gemini_json_config
         )
         return response.text.strip()
     
@@ -274,29 +805,460 @@ class UnifiedLLM:
         if not self.is_valid():
             return None
         
+        key, embedding, cached = self._cache_lookup("plain", prompt, system_prompt)
+        if cached is not None:
+            return cached
+        
+        self.last_error = None
+        try:
+            call = self._gemini_generate if self.api_type == "gemini" else self._openai_generate
+            text = self._single_flight(key, lambda: self._with_retry(lambda: call(prompt, system_prompt)))
+        except Exception as e:
+            self._report_error("API Error", e)
+            return None
+        
+        self._cache_store("plain", system_prompt, key, embedding, text)
+        return text
+    
+    def _openai_generate(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        self._bucket.acquire(estimate_tokens(prompt, system_prompt))
+        response = self._client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(prompt, system_prompt),
+            **self._openai_params()
+        )
+        return response.choices[0].message.content.strip()
+    
+    def _gemini_generate(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        full_prompt = self._gemini_prompt(prompt, system_prompt)
+        self._bucket.acquire(estimate_tokens(full_prompt))
+        response = self._gemini_client.models.generate_content(
+            model=self.model,
+            contents=full_prompt,
+            config=self._gemini_config
+        )
+        return response.text.strip()
+    
+    def submit_batch(self, requests: List[Tuple[str, str]], json_mode: bool = False) -> str:
+        if self.api_type not in BATCH_APIS:
+            raise ValueError(f"Batch API not supported for {self.api_type}")
+        
+        lines = []
+        for i, (prompt, system_prompt) in enumerate(requests):
+            if json_mode:
+                system_prompt = self._json_system_prompt(system_prompt)
+            body = {
+                "model": self.model,
+                "messages": self._build_messages(prompt, system_prompt),
+                **self._openai_params(json_mode)
+            }
+            lines.append(orjson.dumps({"custom_id": f"req-{i}", "method": "POST", "url": BATCH_ENDPOINT, "body": body}))
+        
+        batch_file = self._client.files.create(file=("batch.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def fetch_batch(self, batch_id: str) -> Optional[List[Optional[str]]]:
+        # Responses in submission order, or None while the job is still running
+        batch = self._client.batches.retrieve(batch_id)
+        if batch.status not in BATCH_FINAL_STATES:
+            return None
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+        
+        results = {}
+        for line in self._client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            record = orjson.loads(line)
+            choices = ((record.get("response") or {}).get("body") or {}).get("choices") or []
+            results[record["custom_id"]] = choices[0]["message"]["content"].strip() if choices else None
+        
+        return [results.get(f"req-{i}") for i in range(batch.request_counts.total)]
+    
+    async def join_batch(self, batch_id: str, poll_interval: float = 30, max_interval: float = 600) -> List[Optional[str]]:
+        while True:
+            results = await asyncio.to_thread(self.fetch_batch, batch_id)
+            if results is not None:
+                return results
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_interval)
+    
+    def generate_with_search(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        return self.generate(prompt, system_prompt)
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        tools: List[Dict] = None,
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Iterator[str]:
+        if not self.is_valid():
+            return
+        
+        if self.api_type not in NATIVE_MODE_APIS:
+            tools = None
+        mode = "tools" if tools else "plain"
+        key, _, cached = self._cache_lookup(mode, prompt, system_prompt, tools)
+        if cached is not None:
+            yield cached
+            return
+        
+        self.last_error = None
+        chunks = []
         try:
             if self.api_type == "gemini":
-                full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-                response = self._gemini_client.models.generate_content(
-                    model=self.model,
-                    contents=full_prompt
-                )
-                return response.text.strip()
+                stream = self._gemini_stream(prompt, system_prompt, tools, tool_executor)
             else:
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-                
-                response = self._client.chat.completions.create(
-                    model=self.model,
-                    messages=messages
+                stream = self._openai_stream(prompt, system_prompt, tools, tool_executor)
+            for chunk in stream:
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            self._report_error("Stream Error", e)
+            return
+        
+        self._cache_store(mode, system_prompt, key, None, "".join(chunks).strip())
+    
+    def _openai_stream(
+        self,
+        prompt: str,
+        system_prompt: str,
+        tools: List[Dict] = None,
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Iterator[str]:
+        if tools:
+            messages, answer = self._openai_tool_round(prompt, system_prompt, tools, tool_executor)
+            if messages is None:
+                yield answer
+                return
+        else:
+            messages = self._build_messages(prompt, system_prompt)
+            self._bucket.acquire(estimate_tokens(prompt, system_prompt))
+        
+        stream = self._client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            **self._openai_params()
+        )
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+    
+    def _gemini_stream(
+        self,
+        prompt: str,
+        system_prompt: str,
+        tools: List[Dict] = None,
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Iterator[str]:
+        if tools:
+            contents, config, answer = self._gemini_tool_round(prompt, system_prompt, tools, tool_executor)
+            if contents is None:
+                yield answer
+                return
+        else:
+            contents = self._gemini_prompt(prompt, system_prompt)
+            config = self._gemini_config
+            self._bucket.acquire(estimate_tokens(contents))
+        
+        stream = self._gemini_client.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config
+        )
+        for chunk in stream:
+            yield chunk.text or ""
+
+    def _async_client(self):
+        # httpx connection pools and asyncio primitives are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            if self.api_type == "gemini":
+                self._aclient = get_gemini_aio_client(self.api_key)
+            else:
+                from openai import AsyncOpenAI
+                base_url = API_CONFIGS.get(self.api_type, {}).get("base_url")
+                self._aclient = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=base_url,
+                    http_client=get_async_http_client(base_url),
+                    max_retries=0
                 )
-                return response.choices[0].message.content.strip()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._async_loop = loop
+        return self._aclient
+    
+    async def _athrottle(self, *texts: str):
+        wait = self._bucket.reserve(estimate_tokens(*texts))
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    async def _acache_lookup(self, mode: str, prompt: str, system_prompt: str, tools: List[Dict] = None):
+        if self.cache.semantic and not tools:
+            return await asyncio.to_thread(self._cache_lookup, mode, prompt, system_prompt, tools)
+        return self._cache_lookup(mode, prompt, system_prompt, tools)
+    
+    async def agenerate(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        if not self.is_valid():
+            return None
+        
+        key, embedding, cached = await self._acache_lookup("plain", prompt, system_prompt)
+        if cached is not None:
+            return cached
+        
+        client = self._async_client()
+        
+        async def call():
+            async with self._semaphore:
+                if self.api_type == "gemini":
+                    return await self._awith_retry(lambda: self._agemini_generate(prompt, system_prompt))
+                return await self._awith_retry(lambda: self._aopenai_generate(client, prompt, system_prompt))
+        
+        self.last_error = None
+        try:
+            text = await self._asingle_flight(key, call)
         except Exception as e:
-            if self.console:
-                self.console.print(f"      [dim red]API Error: {str(e)[:80]}[/dim red]")
+            self._report_error("API Error", e)
             return None
+        
+        self._cache_store("plain", system_prompt, key, embedding, text)
+        return text
     
-    def generate_with_search(self, prompt: str, system_prompt: str = "") -> Optional[str]:
-        return self.generate(prompt, system_prompt)
+    async def agenerate_json(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        if not self.is_valid():
+            return None
+        
+        if self.api_type not in NATIVE_MODE_APIS:
+            return await self.agenerate(prompt, system_prompt)
+        
+        key, embedding, cached = await self._acache_lookup("json", prompt, system_prompt)
+        if cached is not None:
+            return cached
+        
+        client = self._async_client()
+        
+        async def call():
+            async with self._semaphore:
+                if self.api_type == "gemini":
+                    return await self._awith_retry(
+                        lambda: self._agemini_generate(prompt, system_prompt, self._gemini_json_config)
+                    )
+                return await self._awith_retry(lambda: self._aopenai_json(client, prompt, system_prompt))
+        
+        self.last_error = None
+        try:
+            response = await self._asingle_flight(key, call)
+        except Exception as e:
+            self._report_error("JSON Error", e)
+            return None
+        
+        self._cache_store("json", system_prompt, key, embedding, response)
+        return response
+    
+    async def agenerate_json_obj(self, prompt: str, system_prompt: str = "", schema=None) -> Optional[Any]:
+        return self._parse_json_obj(await self.agenerate_json(prompt, system_prompt), schema)
+    
+    async def _aopenai_generate(self, client, prompt: str, system_prompt: str = "") -> Optional[str]:
+        await self._athrottle(prompt, system_prompt)
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(prompt, system_prompt),
+            **self._openai_params()
+        )
+        return response.choices[0].message.content.strip()
+    
+    async def _aopenai_json(self, client, prompt: str, system_prompt: str = "") -> Optional[str]:
+        system_prompt = self._json_system_prompt(system_prompt)
+        await self._athrottle(prompt, system_prompt)
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(prompt, system_prompt),
+            **self._openai_params(json_mode=True)
+        )
+        return response.choices[0].message.content.strip()
+    
+    async def _agemini_generate(self, prompt: str, system_prompt: str = "", config=None) -> Optional[str]:
+        full_prompt = self._gemini_prompt(prompt, system_prompt)
+        await self._athrottle(full_prompt)
+        response = await self._aclient.models.generate_content(
+            model=self.model,
+            contents=full_prompt,
+            config=config or self._gemini_config
+        )
+        return response.text.strip()
+    
+    async def agenerate_with_tools(
+        self, 
+        prompt: str, 
+        system_prompt: str = "", 
+        tools: List[Dict] = None,
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Optional[str]:
+        if not self.is_valid():
+            return None
+        
+        if not tools or self.api_type not in NATIVE_MODE_APIS:
+            return await self.agenerate(prompt, system_prompt)
+        
+        key, _, cached = self._cache_lookup("tools", prompt, system_prompt, tools)
+        if cached is not None:
+            return cached
+        
+        self._async_client()
+        self.last_error = None
+        try:
+            async with self._semaphore:
+                if self.api_type == "gemini":
+                    response = await self._agemini_function_call(prompt, system_prompt, tools, tool_executor)
+                else:
+                    response = await self._aopenai_function_call(prompt, system_prompt, tools, tool_executor)
+        except Exception as e:
+            self._report_error("Tool Error", e)
+            return None
+        
+        self._cache_store("tools", system_prompt, key, None, response)
+        return response
+    
+    async def _aopenai_function_call(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        tools: List[Dict],
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Optional[str]:
+        messages = self._build_messages(prompt, system_prompt)
+        
+        await self._athrottle(prompt, system_prompt)
+        response = await self._aclient.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            tool_choice="auto",
+            **self._openai_params()
+        )
+        
+        message = response.choices[0].message
+        
+        if message.tool_calls and tool_executor:
+            messages.append(message.model_dump(exclude_none=True))
+            
+            calls = [(tc.function.name, orjson.loads(tc.function.arguments)) for tc in message.tool_calls]
+            # _run_tools fans parallel tool calls out across threads, same as the sync path
+            results = await asyncio.to_thread(self._run_tools, calls, tool_executor)
+            
+            messages.extend(self._tool_messages(message.tool_calls, results))
+            await self._athrottle(prompt, system_prompt, *map(str, results))
+            final_response = await self._aclient.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **self._openai_params()
+            )
+            return final_response.choices[0].message.content.strip()
+        
+        return message.content.strip() if message.content else None
+    
+    async def _agemini_function_call(
+        self, 
+        prompt: str, 
+        system_prompt: str, 
+        tools: List[Dict],
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Optional[str]:
+        # The first round runs blocking tool executors, so it stays on a worker thread
+        contents, config, answer = await asyncio.to_thread(
+            self._gemini_tool_round, prompt, system_prompt, tools, tool_executor
+        )
+        if contents is None:
+            return answer
+        
+        final_response = await self._aclient.models.generate_content(
+            model=self.model,
+            contents=contents,
+            config=config
+        )
+        return final_response.text.strip()
+
+
+class FallbackLLM:
+    
+    def __init__(
+        self,
+        api_keys: List[str],
+        agent_name: str = "Agent",
+        console=None,
+        cooldown: float = 30,
+        **llm_kwargs
+    ):
+        backends = [UnifiedLLM(key, agent_name, console, **llm_kwargs) for key in api_keys if key]
+        self.backends = [backend for backend in backends if backend.is_valid()]
+        self.cooldown = cooldown
+        self._failed_until = [0.0] * len(self.backends)
+        self.last_error = None
+    
+    @property
+    def model(self) -> Optional[str]:
+        return self.backends[0].model if self.backends else None
+    
+    def is_valid(self) -> bool:
+        return bool(self.backends)
+    
+    def get_info(self) -> str:
+        return " -> ".join(backend.get_info() for backend in self.backends)
+    
+    def _call(self, method: str, *args, **kwargs):
+        self.last_error = None
+        now = time.monotonic()
+        order = [i for i, until in enumerate(self._failed_until) if until <= now]
+        # Every backend is cooling down: try them all anyway rather than fail outright
+        for i in order or range(len(self.backends)):
+            backend = self.backends[i]
+            result = getattr(backend, method)(*args, **kwargs)
+            if result is not None or backend.last_error is None:
+                return result
+            
+            self.last_error = backend.last_error
+            self._failed_until[i] = time.monotonic() + self.cooldown
+        return None
+    
+    def generate(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        return self._call("generate", prompt, system_prompt)
+    
+    def generate_json(self, prompt: str, system_prompt: str = "") -> Optional[str]:
+        return self._call("generate_json", prompt, system_prompt)
+    
+    def generate_stream(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        # Fails over only until the first chunk arrives; a stream can't be resumed elsewhere
+        self.last_error = None
+        now = time.monotonic()
+        order = [i for i, until in enumerate(self._failed_until) if until <= now]
+        for i in order or range(len(self.backends)):
+            backend = self.backends[i]
+            started = False
+            for chunk in backend.generate_stream(prompt, system_prompt):
+                started = True
+                yield chunk
+            if started or backend.last_error is None:
+                return
+            
+            self.last_error = backend.last_error
+            self._failed_until[i] = time.monotonic() + self.cooldown
+    
+    def generate_json_obj(self, prompt: str, system_prompt: str = "", schema=None) -> Optional[Any]:
+        return self._call("generate_json_obj", prompt, system_prompt, schema=schema)
+    
+    def generate_with_tools(
+        self, 
+        prompt: str, 
+        system_prompt: str = "", 
+        tools: List[Dict] = None,
+        tool_executor: Callable[[str, Dict], str] = None
+    ) -> Optional[str]:
+        return self._call("generate_with_tools", prompt, system_prompt, tools, tool_executor)
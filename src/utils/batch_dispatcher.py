@@ -0,0 +1,108 @@
+"""
+Batch Dispatcher - Pools latency-tolerant LLM calls into provider batch jobs.
+Calls with a tight latency budget go straight to UnifiedLLM.generate.
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+
+from src.utils.api_adapter import UnifiedLLM, BATCH_APIS
+
+
+class RoutingPolicy:
+    """Decides which calls are pooled and when a pool is flushed."""
+
+    def __init__(self, realtime_budget_ms: int = 5000, batch_min_size: int = 8, batch_window_ms: int = 2000):
+        self.realtime_budget_ms = realtime_budget_ms
+        self.batch_min_size = batch_min_size
+        self.batch_window_ms = batch_window_ms
+
+    def is_realtime(self, latency_budget_ms: int) -> bool:
+        return latency_budget_ms < self.realtime_budget_ms
+
+
+class BatchDispatcher:
+    """
+    Collects submitted prompts and flushes them as one batch job.
+    OpenAI keys use the Batch API (half price, up to 24h turnaround);
+    other providers are flushed as concurrent regular calls.
+    """
+
+    def __init__(self, llm: UnifiedLLM, policy: RoutingPolicy = None, poll_interval: float = 30):
+        self.llm = llm
+        self.policy = policy or RoutingPolicy()
+        self.poll_interval = poll_interval
+        self._pending: List[Tuple[str, str, Future]] = []
+        self._first_pending_at = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, prompt: str, system_prompt: str = "", latency_budget_ms: int = 60000) -> Future:
+        if self.policy.is_realtime(latency_budget_ms):
+            future = Future()
+            future.set_result(self.llm.generate(prompt, system_prompt))
+            return future
+
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BatchDispatcher is closed")
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append((prompt, system_prompt, future))
+            self._condition.notify()
+        return future
+
+    def flush(self):
+        with self._condition:
+            jobs, self._pending = self._pending, []
+            self._first_pending_at = None
+        if jobs:
+            # Batch jobs can take hours; poll each one on its own thread
+            threading.Thread(target=self._dispatch, args=(jobs,), daemon=True).start()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        window = self.policy.batch_window_ms / 1000
+        while True:
+            with self._condition:
+                while not self._closed and not self._pending:
+                    self._condition.wait()
+                if self._closed:
+                    return
+
+                waited = time.monotonic() - self._first_pending_at
+                if len(self._pending) < self.policy.batch_min_size and waited < window:
+                    self._condition.wait(window - waited)
+                    continue
+            self.flush()
+
+    def _dispatch(self, jobs: List[Tuple[str, str, Future]]):
+        try:
+            if self.llm.api_type in BATCH_APIS:
+                results = self._run_openai_batch(jobs)
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(jobs), 8)) as executor:
+                    results = list(executor.map(lambda job: self.llm.generate(job[0], job[1]), jobs))
+        except Exception as e:
+            for _, _, future in jobs:
+                future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(jobs, results):
+            future.set_result(result)
+
+    def _run_openai_batch(self, jobs: List[Tuple[str, str, Future]]) -> List:
+        batch_id = self.llm.submit_batch([(prompt, system_prompt) for prompt, system_prompt, _ in jobs])
+        return asyncio.run(self.llm.join_batch(batch_id, self.poll_interval))
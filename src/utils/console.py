@@ -2,6 +2,7 @@
 Beautiful Console Output - Full content display without truncation.
 """
 
+import os
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -9,7 +10,10 @@ from rich.text import Text
 from rich.box import ROUNDED, DOUBLE
 from typing import List, Dict
 
-console = Console()
+# Markup carries all styling, so the regex highlighter is skipped; CONSOLE_WIDTH pins
+# the width instead of re-detecting the terminal size
+_width = os.getenv("CONSOLE_WIDTH")
+console = Console(highlight=False, width=int(_width) if _width else None)
 
 
 def print_header(title: str, subtitle: str = ""):
@@ -21,19 +25,25 @@ def print_header(title: str, subtitle: str = ""):
     console.print(Panel(content, box=DOUBLE, style="cyan", padding=(1, 2)))
 
 
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
 def print_event(title: str, event_id: str, description: str = "", rules: str = "", date: str = ""):
     """Print event information captured from Polymarket."""
-    content = f"[bold white]{title}[/bold white]\n"
-    content += f"[dim]Event ID: {event_id}[/dim]"
+    parts = [f"[bold white]{title}[/bold white]\n[dim]Event ID: {event_id}[/dim]"]
     
     if description:
-        content += f"\n\n[cyan]Description:[/cyan]\n{description[:300]}..." if len(description) > 300 else f"\n\n[cyan]Description:[/cyan]\n{description}"
+        parts.append(f"\n\n[cyan]Description:[/cyan]\n{_truncate(description, 300)}")
     
     if rules:
-        content += f"\n\n[cyan]Resolution Rules:[/cyan]\n{rules[:200]}..." if len(rules) > 200 else f"\n\n[cyan]Resolution Rules:[/cyan]\n{rules}"
+        parts.append(f"\n\n[cyan]Resolution Rules:[/cyan]\n{_truncate(rules, 200)}")
     
     if date:
-        content += f"\n\n[cyan]Resolution Date:[/cyan] {date}"
+        parts.append(f"\n\n[cyan]Resolution Date:[/cyan] {date}")
+    
+    content = "".join(parts)
     
     console.print(Panel(
         content,
@@ -55,23 +65,21 @@ def print_prediction(agent_name: str, prediction: str, probability: float, ratio
     """Print a single prediction - FULL content, no truncation."""
     color = "green" if prediction == "YES" else "red" if prediction == "NO" else "yellow"
     
-    content = Text()
-    content.append(f"Prediction: ", style="dim")
-    content.append(f"{prediction}\n", style=f"bold {color}")
-    content.append(f"Probability: ", style="dim")
-    content.append(f"{probability*100:.0f}%\n\n", style=f"bold {color}")
-    
-    # Full rationale - no truncation
-    content.append(f"Rationale:\n", style="bold")
-    content.append(f"{rationale}\n\n", style="white")
-    
-    # All claims - full content
-    content.append(f"Key Claims:\n", style="bold")
+    parts = [
+        ("Prediction: ", "dim"),
+        (f"{prediction}\n", f"bold {color}"),
+        ("Probability: ", "dim"),
+        (f"{probability*100:.0f}%\n\n", f"bold {color}"),
+        # Full rationale - no truncation
+        ("Rationale:\n", "bold"),
+        (f"{rationale}\n\n", "white"),
+        # All claims - full content
+        ("Key Claims:\n", "bold"),
+    ]
     for i, fact in enumerate(facts, 1):
-        claim = fact.get('claim', '')
-        source = fact.get('source', 'No source')
-        content.append(f"  {i}. {claim}\n", style="white")
-        content.append(f"     Source: {source}\n", style="dim cyan")
+        parts.append((f"  {i}. {fact.get('claim', '')}\n", "white"))
+        parts.append((f"     Source: {fact.get('source', 'No source')}\n", "dim cyan"))
+    content = Text.assemble(*parts)
     
     console.print(Panel(
         content,
@@ -89,16 +97,13 @@ def print_predictions_table(predictions: List[Dict]):
     table.add_column("Prediction", justify="center")
     table.add_column("Probability", justify="center")
     
-    for p in predictions:
-        pred = p.get('prediction', 'N/A')
+    rows = [
+        (p.get('agent_name', 'Unknown'), p.get('prediction', 'N/A'), p.get('probability', 0))
+        for p in predictions
+    ]
+    for agent_name, pred, prob in rows:
         color = "green" if pred == "YES" else "red" if pred == "NO" else "yellow"
-        prob = p.get('probability', 0)
-        
-        table.add_row(
-            p.get('agent_name', 'Unknown'),
-            f"[{color}]{pred}[/{color}]",
-            f"[{color}]{prob*100:.0f}%[/{color}]"
-        )
+        table.add_row(agent_name, f"[{color}]{pred}[/{color}]", f"[{color}]{prob*100:.0f}%[/{color}]")
     
     console.print(table)
     console.print()
@@ -0,0 +1,15 @@
+"""
+Event Loop - Shared event loop factory.
+Uses uvloop when it is installed, otherwise the standard asyncio loop.
+"""
+
+import asyncio
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it is installed."""
+    try:
+        import uvloop
+        return uvloop.new_event_loop()
+    except ImportError:
+        return asyncio.new_event_loop()
@@ -0,0 +1,198 @@
+"""
+LLM Cache - Exact-match response cache with pluggable storage backends.
+MemoryBackend is a bounded per-process LRU; DiskBackend persists across runs.
+An optional SemanticCache tier answers near-duplicate prompts by embedding similarity.
+"""
+
+import os
+import math
+import time
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import orjson
+
+
+class CacheBackend(ABC):
+    """Stores (stored_at, response) pairs by key; expiry is handled by LLMCache."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, stored_at: float, response: str):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, stored_at: float, response: str):
+        with self._lock:
+            self._entries[key] = (stored_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskBackend(CacheBackend):
+    """One JSON file per key, so cached answers survive between runs."""
+
+    def __init__(self, directory: str = os.path.join("~", ".cache", "ai-battle", "llm")):
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        try:
+            with open(self._path(key), "rb") as f:
+                stored_at, response = orjson.loads(f.read())
+            return stored_at, response
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, stored_at: float, response: str):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps([stored_at, response]))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+EMBEDDING_MODELS = {
+    "openai": "text-embedding-3-small",
+    "gemini": "text-embedding-004"
+}
+
+LOCAL_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def local_embedder(model_name: str = LOCAL_EMBEDDING_MODEL) -> Optional[Callable[[str], List[float]]]:
+    """Embeds on-device with sentence-transformers, or None if it isn't installed."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    model = SentenceTransformer(model_name)
+    return lambda text: model.encode(text, normalize_embeddings=True).tolist()
+
+
+class SemanticCache:
+    """
+    Returns the stored answer whose prompt embedding is most similar to the query,
+    if the cosine similarity reaches the threshold. Without an embedder,
+    UnifiedLLM uses its provider's embedding endpoint.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 256,
+        embedder: Optional[Callable[[str], List[float]]] = None
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embedder = embedder
+        self._buckets: Dict[Tuple, OrderedDict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return [x / norm for x in embedding]
+
+    def lookup(self, bucket: Tuple, embedding: List[float]) -> Optional[str]:
+        query = self._normalize(embedding)
+        with self._lock:
+            entries = self._buckets.get(bucket)
+            if not entries:
+                return None
+
+            best_key, best_score = None, self.threshold
+            for key, (vector, _) in entries.items():
+                score = sum(a * b for a, b in zip(query, vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                return None
+            entries.move_to_end(best_key)
+            return entries[best_key][1]
+
+    def store(self, bucket: Tuple, key: str, embedding: List[float], response: str):
+        vector = self._normalize(embedding)
+        with self._lock:
+            entries = self._buckets.setdefault(bucket, OrderedDict())
+            entries[key] = (vector, response)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+
+class LLMCache:
+    """TTL cache for deterministic LLM calls, keyed by a hash of the full request."""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 3600,
+        semantic: Optional[SemanticCache] = None
+    ):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.semantic = semantic
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.time() - stored_at > self.ttl:
+            self.backend.delete(key)
+            return None
+        return response
+
+    def set(self, key: str, response: Optional[str]):
+        if response:
+            self.backend.set(key, time.time(), response)
+
+
+# Process-wide default, shared by every UnifiedLLM that isn't given its own cache
+DEFAULT_CACHE = LLMCache()
@@ -4,9 +4,20 @@ Uses ElevenLabs API for high-quality, natural voices.
 Falls back to edge-tts if ElevenLabs is not configured.
 """
 
+import io
+import re
+import atexit
 import os
+import sys
+import shutil
+import hashlib
+import queue
+import asyncio
 import tempfile
-import pygame
+import threading
+import time
+
+from src.utils.event_loop import new_event_loop
 
 # ElevenLabs voice IDs for each agent (distinct voices)
 ELEVENLABS_VOICES = {
@@ -25,98 +36,212 @@ EDGE_VOICES = {
 }
 
 DEFAULT_VOICE = "21m00Tcm4TlvDq8ikWAM"
+ELEVENLABS_MODEL = "eleven_turbo_v2_5"
+
+# Synthesized clips are reused across runs; moderator boilerplate is free after the first
+TTS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai-battle", "tts")
+
+# Clips synthesized ahead of the one playing in speak_sequence
+TTS_LOOKAHEAD = 1
+
+# End of a sentence: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# A period that ends a title or initial ("Dr.", "U.S.") rather than the sentence
+_ABBREVIATION = re.compile(r"(?:\b(?:Dr|Mr|Mrs|Ms|Prof|Sr|Jr|St|vs|approx|No)|\b[A-Z])\.$")
+
+
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _run_async(coro):
+    """Run a coroutine on the shared background loop and wait for its result."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            if sys.platform == 'win32':
+                asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+            _LOOP = new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
+
+
+def _tts_cache_path(text, voice_id):
+    """Cache file for a (text, voice, model) combination."""
+    key = hashlib.sha256(f"{text}|{voice_id}|{ELEVENLABS_MODEL}".encode()).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+
+def _write_cache(data, path):
+    """Persist a complete clip to the cache; returns False if it can't be written."""
+    try:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+def _tee_to_cache(audio, path):
+    """Yield audio chunks, then persist the complete clip to the cache."""
+    chunks = []
+    for chunk in audio:
+        chunks.append(chunk)
+        yield chunk
+    
+    _write_cache(b"".join(chunks), path)
+
+
+def _ensure_mixer():
+    """Open the audio device once per process; reopening it per utterance is slow."""
+    import pygame
+    
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+        atexit.register(pygame.mixer.quit)
+
+
+def _play_mp3(source):
+    """Play an MP3 file path or file object and block until it ends."""
+    import pygame
+    
+    _ensure_mixer()
+    # A Sound knows its duration, so playback is one sleep instead of a 10 Hz poll.
+    # (music.set_endevent would need the video subsystem and an event pump.)
+    sound = pygame.mixer.Sound(source)
+    channel = sound.play()
+    if channel is None:
+        # Every mixer channel is busy; take over the one playing longest
+        channel = pygame.mixer.find_channel(True)
+        if channel is None:
+            return
+        channel.play(sound)
+    time.sleep(sound.get_length())
+    
+    # Only the last few milliseconds of mixer buffer can remain
+    while channel.get_busy():
+        time.sleep(0.005)
+
+
+def _elevenlabs_audio(api_key, text, voice_id):
+    """Request a clip from ElevenLabs; returns an iterator of MP3 chunks."""
+    from elevenlabs import ElevenLabs
+    
+    client = ElevenLabs(api_key=api_key)
+    return client.text_to_speech.convert(
+        text=text,
+        voice_id=voice_id,
+        model_id=ELEVENLABS_MODEL,
+        output_format="mp3_44100_128"
+    )
+
+
+def _elevenlabs_key():
+    return os.getenv("ELEVENLABS_API_KEY") or os.getenv("ELEVENLABS_KEY")
 
 
 def _speak_elevenlabs(text, agent_name):
     """Speak using ElevenLabs API."""
     try:
-        from elevenlabs import ElevenLabs
-        
-        api_key = os.getenv("ELEVENLABS_API_KEY") or os.getenv("ELEVENLABS_KEY")
+        api_key = _elevenlabs_key()
         if not api_key:
             return False
         
-        client = ElevenLabs(api_key=api_key)
         voice_id = ELEVENLABS_VOICES.get(agent_name, DEFAULT_VOICE)
+        cache_path = _tts_cache_path(text, voice_id)
+        if os.path.exists(cache_path):
+            _play_mp3(cache_path)
+            return True
         
-        # Generate audio
-        audio = client.text_to_speech.convert(
-            text=text,
-            voice_id=voice_id,
-            model_id="eleven_turbo_v2_5",
-            output_format="mp3_44100_128"
-        )
+        audio = _tee_to_cache(_elevenlabs_audio(api_key, text, voice_id), cache_path)
         
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
-            for chunk in audio:
-                f.write(chunk)
-            temp_path = f.name
+        # mpv plays the MP3 as chunks arrive instead of after the full download
+        if shutil.which("mpv"):
+            from elevenlabs import stream
+            stream(audio)
+            return True
         
-        # Play audio
-        pygame.mixer.init()
-        pygame.mixer.music.load(temp_path)
-        pygame.mixer.music.play()
+        # Otherwise decode from memory, skipping the temp-file round-trip
+        _play_mp3(io.BytesIO(b"".join(audio)))
         
-        while pygame.mixer.music.get_busy():
-            pygame.time.Clock().tick(10)
+        return True
         
-        pygame.mixer.quit()
+    except Exception as e:
+        print(f"[ElevenLabs Error: {e}]")
+        return False
+
+
+def _synthesize_elevenlabs(text, agent_name, cache=True):
+    """Render a clip into the TTS cache (or a temp file); returns (path, is_temp) or None."""
+    try:
+        api_key = _elevenlabs_key()
+        if not api_key:
+            return None
         
-        # Cleanup
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+        voice_id = ELEVENLABS_VOICES.get(agent_name, DEFAULT_VOICE)
+        cache_path = _tts_cache_path(text, voice_id)
+        if cache and os.path.exists(cache_path):
+            return cache_path, False
         
-        return True
+        audio = b"".join(_elevenlabs_audio(api_key, text, voice_id))
+        if cache and _write_cache(audio, cache_path):
+            return cache_path, False
+        
+        # Uncached or unwritable cache (e.g. read-only home in a container): use a temp file
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+            f.write(audio)
+        return f.name, True
         
     except Exception as e:
         print(f"[ElevenLabs Error: {e}]")
-        return False
+        return None
 
 
-def _speak_edge_tts(text, agent_name):
-    """Fallback to edge-tts."""
+def _synthesize_edge_tts(text, agent_name):
+    """Render a clip with edge-tts into a temp file and return its path, or None."""
     try:
-        import asyncio
         import edge_tts
-        import sys
         
         voice = EDGE_VOICES.get(agent_name, "en-US-AriaNeural")
         
-        async def _speak_async():
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
-                temp_path = f.name
-            
-            try:
-                communicate = edge_tts.Communicate(text, voice)
-                await communicate.save(temp_path)
-                
-                pygame.mixer.init()
-                pygame.mixer.music.load(temp_path)
-                pygame.mixer.music.play()
-                
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
-                
-                pygame.mixer.quit()
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-        
-        if sys.platform == 'win32':
-            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+            temp_path = f.name
+        
         try:
-            loop.run_until_complete(_speak_async())
-        finally:
-            loop.close()
+            _run_async(edge_tts.Communicate(text, voice).save(temp_path))
+        except Exception:
+            os.unlink(temp_path)
+            raise
         
+        return temp_path
+    except Exception as e:
+        print(f"[Edge-TTS Error: {e}]")
+        return None
+
+
+def _play_temp(path):
+    """Play a temp clip, then delete it."""
+    try:
+        _play_mp3(path)
+    finally:
+        try:
+            os.unlink(path)
+        except:
+            pass
+
+
+def _speak_edge_tts(text, agent_name):
+    """Fallback to edge-tts."""
+    temp_path = _synthesize_edge_tts(text, agent_name)
+    if not temp_path:
+        return False
+    
+    try:
+        _play_temp(temp_path)
         return True
     except Exception as e:
         print(f"[Edge-TTS Error: {e}]")
@@ -136,6 +261,79 @@ def speak(text, agent_name="Moderator"):
     _speak_edge_tts(text, agent_name)
 
 
+def _synthesize(text, agent_name, cache=True):
+    """Render an utterance to an MP3 file; returns (path, is_temp) or None."""
+    clip = _synthesize_elevenlabs(text, agent_name, cache)
+    if clip:
+        return clip
+    path = _synthesize_edge_tts(text, agent_name)
+    return (path, True) if path else None
+
+
+def speak_sequence(utterances, on_start=None, cache=True):
+    """
+    Speak (text, agent_name) pairs in order, synthesizing the next
+    utterance while the current one plays. utterances may be a generator,
+    e.g. sentences of a response that is still streaming in.
+    on_start(agent_name, text) is called as each utterance begins.
+    Pass cache=False for one-off text that isn't worth keeping in the TTS cache.
+    """
+    clips = queue.Queue()
+    # One permit per clip that may be synthesized before playback reaches it
+    ahead = threading.Semaphore(TTS_LOOKAHEAD)
+    
+    def _produce():
+        try:
+            for text, agent_name in utterances:
+                ahead.acquire()
+                clips.put((text, agent_name, _synthesize(text, agent_name, cache)))
+        finally:
+            clips.put(None)
+    
+    threading.Thread(target=_produce, daemon=True).start()
+    
+    while True:
+        item = clips.get()
+        if item is None:
+            break
+        ahead.release()
+        
+        text, agent_name, clip = item
+        if on_start:
+            on_start(agent_name, text)
+        if clip is None:
+            continue
+        
+        path, is_temp = clip
+        try:
+            if is_temp:
+                _play_temp(path)
+            else:
+                _play_mp3(path)
+        except Exception as e:
+            print(f"[Playback Error: {e}]")
+
+
+def split_sentences(chunks):
+    """Regroup streamed text chunks into whole sentences as soon as each one ends."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *pieces, buffer = _SENTENCE_END.split(buffer)
+        sentence = ""
+        for piece in pieces:
+            sentence = f"{sentence} {piece}" if sentence else piece
+            if not _ABBREVIATION.search(sentence):
+                if sentence.strip():
+                    yield sentence.strip()
+                sentence = ""
+        if sentence:
+            # Ends in an abbreviation: keep it with the text that follows
+            buffer = f"{sentence} {buffer}"
+    if buffer.strip():
+        yield buffer.strip()
+
+
 def get_voice_for_agent(agent_name):
     """Get the voice ID for a given agent."""
     return ELEVENLABS_VOICES.get(agent_name, DEFAULT_VOICE)
@@ -154,10 +352,10 @@ def test_voice():
         "Gemini": "Historical constraints make this unlikely.",
     }
     
-    for agent, text in test_texts.items():
-        console.print(f"   {agent} speaking...")
-        speak(text, agent)
-        console.print(f"   Done")
+    speak_sequence(
+        [(text, agent) for agent, text in test_texts.items()],
+        on_start=lambda agent, _: console.print(f"   {agent} speaking...")
+    )
     
     console.print("\n Voice test complete!")
     return True